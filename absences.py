@@ -0,0 +1,57 @@
+"""
+Absence Marking
+Marks employees Absent on working days where they have no attendance record
+"""
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+# One set-based statement per chunk: build the working days in the range, cross them with
+# employees, and insert Absent for every pair that has no attendance row and no approved leave
+MARK_ABSENCES_SQL = text("""
+    WITH RECURSIVE days(day) AS (
+        SELECT :start_date
+        UNION ALL
+        SELECT date(day, '+1 day') FROM days WHERE day < :end_date
+    ),
+    working_days(day) AS (
+        SELECT day FROM days
+        WHERE strftime('%w', day) NOT IN ('0', '6')
+          AND day NOT IN (SELECT holiday.date FROM holiday)
+    )
+    INSERT INTO attendance (user_id, date, status, created_at)
+    SELECT user.id, working_days.day, 'Absent', :created_at
+    FROM user CROSS JOIN working_days
+    WHERE user.role = 'Employee'
+      AND (user.hire_date IS NULL OR user.hire_date <= working_days.day)
+      AND NOT EXISTS (
+          SELECT 1 FROM attendance
+          WHERE attendance.user_id = user.id AND attendance.date = working_days.day
+      )
+      AND NOT EXISTS (
+          SELECT 1 FROM leave_request
+          WHERE leave_request.user_id = user.id
+            AND leave_request.status = 'Approved'
+            AND working_days.day BETWEEN leave_request.start_date AND leave_request.end_date
+      )
+    RETURNING user_id, date
+""")
+
+def mark_absences(session, start_date, end_date):
+    """Insert Absent records for one date range and return the (user_id, date) pairs written
+
+    Safe to re-run: days that already have a record are skipped.
+    """
+    result = session.execute(MARK_ABSENCES_SQL, {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'created_at': datetime.now().isoformat(' ')
+    })
+    return [(user_id, datetime.strptime(day, '%Y-%m-%d').date()) for user_id, day in result]
+
+def date_chunks(start_date, end_date, chunk_days):
+    """Split an inclusive date range into consecutive ranges of at most chunk_days days"""
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end + timedelta(days=1)
@@ -0,0 +1,199 @@
+"""
+Attendance Analytics
+Computes worked hours, lateness, early leaves and overtime in bulk from check-in/out pairs
+"""
+from collections import namedtuple
+import numpy as np
+from sqlalchemy import text
+
+# Working day rules (seconds since midnight)
+SHIFT_START = 9 * 3600
+SHIFT_END = 17 * 3600
+STANDARD_DAY = 8 * 3600
+HALF_DAY_THRESHOLD = 4 * 3600
+
+# Each employee's check-in/out pairs are concatenated into one string, so a quarter of data
+# crosses into Python as one row per employee and is decoded by numpy in a single pass.
+# SQLAlchemy stores times as fixed-width 'HH:MM:SS.ffffff', which is concatenated as stored.
+# If any row was written in another format, the range is re-read through SQLite's time(),
+# which normalises every value to 'HH:MM:SS' (NULL when it cannot be parsed)
+STORED_TIME_FORMAT = b'00:00:00.000000'
+NORMALISED_TIME_FORMAT = b'00:00:00'
+
+ATTENDANCE_COLUMNS_SQL = text("""
+    SELECT attendance.user_id,
+           COUNT(*),
+           group_concat(attendance.check_in || COALESCE(attendance.check_out, :missing), '')
+    FROM attendance
+    WHERE attendance.date >= :start_date
+      AND attendance.date <= :end_date
+      AND attendance.check_in IS NOT NULL
+    GROUP BY attendance.user_id
+""")
+
+# Rows whose check-in cannot be parsed are skipped; an unparseable check-out counts as missing
+NORMALISED_ATTENDANCE_COLUMNS_SQL = text("""
+    SELECT attendance.user_id,
+           COUNT(*),
+           group_concat(time(attendance.check_in) || COALESCE(time(attendance.check_out), :missing), '')
+    FROM attendance
+    WHERE attendance.date >= :start_date
+      AND attendance.date <= :end_date
+      AND time(attendance.check_in) IS NOT NULL
+    GROUP BY attendance.user_id
+""")
+
+EMPLOYEES_SQL = text("""
+    SELECT id, employee_id, first_name, last_name, department
+    FROM user
+    WHERE role = 'Employee'
+    ORDER BY id
+""")
+
+EmployeeSummary = namedtuple('EmployeeSummary', [
+    'user_id', 'employee_id', 'name', 'department', 'days_worked', 'hours_worked',
+    'late_arrivals', 'early_leaves', 'overtime_hours', 'half_days'
+])
+
+DepartmentSummary = namedtuple('DepartmentSummary', [
+    'department', 'employees', 'days_worked', 'hours_worked', 'average_hours',
+    'late_arrivals', 'early_leaves', 'overtime_hours', 'half_days'
+])
+
+def _seconds(digits, offset):
+    """Convert the 'HH:MM:SS' column starting at offset into seconds since midnight"""
+    hours = digits[:, offset] * 10 + digits[:, offset + 1]
+    minutes = digits[:, offset + 3] * 10 + digits[:, offset + 4]
+    seconds = digits[:, offset + 6] * 10 + digits[:, offset + 7]
+    return hours * 3600 + minutes * 60 + seconds
+
+def _unpack_times(rows, time_format):
+    """Decode packed check-in/out pairs where every time has the shape of time_format
+
+    Returns (user_ids, check_in, check_out), or None if any value does not fit the format.
+    A missing check-out is returned as -1.
+    """
+    width = len(time_format)
+    user_ids = np.repeat(
+        np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+        np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    )
+    packed = ''.join(row[2] for row in rows).encode('ascii', 'replace')
+    if len(packed) != len(user_ids) * 2 * width:
+        return None
+    pairs = np.frombuffer(packed, dtype=np.uint8).reshape(-1, 2 * width)
+
+    # Separators must sit where the format puts them and everything else must be a digit
+    template = np.frombuffer(time_format * 2, dtype=np.uint8)
+    separators = template != ord('0')
+    if not (pairs[:, separators] == template[separators]).all():
+        return None
+    # Bytes below '0' wrap around to large values, so one comparison checks both bounds
+    digits = pairs - np.uint8(ord('0'))
+    if (digits[:, ~separators] > 9).any():
+        return None
+    digits = digits.astype(np.int32)
+
+    check_in = _seconds(digits, 0)
+    check_out = np.where(digits[:, width] == 9, -1, _seconds(digits, width))
+    return user_ids, check_in, check_out
+
+def fetch_attendance_columns(session, start_date, end_date):
+    """Return (user_ids, check_in_seconds, check_out_seconds) arrays for a date range
+
+    A missing check-out is returned as -1.
+    """
+    for statement, time_format in ((ATTENDANCE_COLUMNS_SQL, STORED_TIME_FORMAT),
+                                   (NORMALISED_ATTENDANCE_COLUMNS_SQL, NORMALISED_TIME_FORMAT)):
+        rows = session.execute(statement, {
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            # Parses as hour 99, which marks a missing check-out
+            'missing': '99' + time_format.decode()[2:]
+        }).all()
+        columns = _unpack_times(rows, time_format)
+        if columns is not None:
+            return columns
+    raise ValueError('time() returned a value that is not HH:MM:SS')
+
+def compute_daily_metrics(check_in, check_out):
+    """Compute per-row worked seconds, lateness, early leave, overtime and half-day flags"""
+    checked_out = check_out >= 0
+    worked = np.where(checked_out, np.maximum(check_out - check_in, 0), 0)
+    return {
+        'worked': worked,
+        'late': check_in > SHIFT_START,
+        'early_leave': checked_out & (check_out < SHIFT_END),
+        'overtime': np.maximum(worked - STANDARD_DAY, 0),
+        'half_day': checked_out & (worked < HALF_DAY_THRESHOLD)
+    }
+
+def attendance_report(session, start_date, end_date, offset=0, limit=None):
+    """Build per-employee and per-department attendance summaries for a date range
+
+    Totals are computed for every employee; only employees[offset:offset + limit] are
+    returned as rows. Returns (employee_rows, department_rows, employee_count).
+    """
+    employees = session.execute(EMPLOYEES_SQL).all()
+    user_ids, check_in, check_out = fetch_attendance_columns(session, start_date, end_date)
+
+    # Map each attendance row to its employee's position in the employee list
+    employee_ids = np.array([employee.id for employee in employees], dtype=np.int64)
+    positions = np.searchsorted(employee_ids, user_ids)
+    positions = np.minimum(positions, max(len(employee_ids) - 1, 0))
+    known = (employee_ids[positions] == user_ids) if len(employee_ids) else np.zeros(len(user_ids), dtype=bool)
+    positions = positions[known]
+    metrics = compute_daily_metrics(check_in[known], check_out[known])
+
+    size = len(employees)
+    days_worked = np.bincount(positions, minlength=size)
+    totals = {
+        name: np.bincount(positions, weights=values, minlength=size)
+        for name, values in metrics.items()
+    }
+
+    employee_rows = [
+        EmployeeSummary(
+            user_id=employee.id,
+            employee_id=employee.employee_id,
+            name=f"{employee.first_name} {employee.last_name}",
+            department=employee.department or '-',
+            days_worked=int(days_worked[i]),
+            hours_worked=round(float(totals['worked'][i]) / 3600, 1),
+            late_arrivals=int(totals['late'][i]),
+            early_leaves=int(totals['early_leave'][i]),
+            overtime_hours=round(float(totals['overtime'][i]) / 3600, 1),
+            half_days=int(totals['half_day'][i])
+        )
+        for i, employee in enumerate(employees[offset:offset + limit if limit else None], start=offset)
+    ]
+
+    # Roll employee totals up into departments
+    departments, department_index = np.unique(
+        np.array([employee.department or '-' for employee in employees], dtype=object).astype(str),
+        return_inverse=True
+    )
+    department_count = len(departments)
+    headcount = np.bincount(department_index, minlength=department_count)
+    department_days = np.bincount(department_index, weights=days_worked, minlength=department_count)
+    department_totals = {
+        name: np.bincount(department_index, weights=values, minlength=department_count)
+        for name, values in totals.items()
+    }
+
+    department_rows = [
+        DepartmentSummary(
+            department=str(department),
+            employees=int(headcount[i]),
+            days_worked=int(department_days[i]),
+            hours_worked=round(float(department_totals['worked'][i]) / 3600, 1),
+            average_hours=round(float(department_totals['worked'][i]) / 3600 / int(department_days[i]), 2) if department_days[i] else 0.0,
+            late_arrivals=int(department_totals['late'][i]),
+            early_leaves=int(department_totals['early_leave'][i]),
+            overtime_hours=round(float(department_totals['overtime'][i]) / 3600, 1),
+            half_days=int(department_totals['half_day'][i])
+        )
+        for i, department in enumerate(departments)
+    ]
+
+    return employee_rows, department_rows, len(employees)
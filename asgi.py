@@ -0,0 +1,157 @@
+"""
+Async Read Path
+ASGI app serving JSON versions of the read-heavy pages (dashboards, attendance, leave, payroll)
+for kiosks and wall screens that hold many long-lived connections.
+
+It reuses the Flask app's config, models, session cookie and role checks, and reads through
+an aiosqlite engine with a bounded connection pool, so an idle connection holds no thread.
+Run it next to the WSGI app and route /api/ to it:
+
+    uvicorn asgi:app --port 8001
+"""
+import json
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+from datetime import date
+from itsdangerous import BadSignature
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app import create_app
+from auth import check_access, is_admin
+from models import db, User
+from payloads import user_json, attendance_json, leave_json
+from queries import (parse_date, recent_attendance_query, pending_leave_count_query, employees_query,
+                     attendance_query, leave_requests_query, payroll_query)
+
+# Upper bound on concurrent SQLite connections; further requests wait up to POOL_TIMEOUT seconds
+POOL_SIZE = 10
+POOL_TIMEOUT = 30
+
+async def employee_dashboard(session, user, params):
+    if is_admin(user):
+        return 302, {'location': '/api/admin/dashboard'}
+    recent_attendance = (await session.scalars(recent_attendance_query(user, limit=5))).all()
+    return 200, {
+        'user': user_json(user),
+        'recent_attendance': [attendance_json(record) for record in recent_attendance],
+        'pending_leaves': await session.scalar(pending_leave_count_query(user)),
+    }
+
+async def admin_dashboard(session, user, params):
+    employees = (await session.scalars(employees_query())).all()
+    recent_attendance = (await session.scalars(recent_attendance_query(limit=10))).all()
+    return 200, {
+        'employees': [user_json(employee) for employee in employees],
+        'recent_attendance': [attendance_json(record) for record in recent_attendance],
+        'pending_leaves': await session.scalar(pending_leave_count_query()),
+    }
+
+async def attendance(session, user, params):
+    view_type = params.get('view', 'daily')
+    selected_date = parse_date(params.get('date'), date.today())
+    records = (await session.scalars(attendance_query(user, view_type, selected_date))).all()
+    return 200, {
+        'view': view_type,
+        'attendance_records': [attendance_json(record) for record in records],
+    }
+
+async def leave(session, user, params):
+    leave_requests = (await session.scalars(leave_requests_query(user))).all()
+    return 200, {'leave_requests': [leave_json(leave_request) for leave_request in leave_requests]}
+
+async def payroll(session, user, params):
+    employees = (await session.scalars(payroll_query(user))).all()
+    return 200, {
+        'is_admin': is_admin(user),
+        'employees': [dict(user_json(employee), salary=employee.salary) for employee in employees],
+    }
+
+# path -> (handler, admin only)
+ROUTES = {
+    '/api/employee/dashboard': (employee_dashboard, False),
+    '/api/admin/dashboard': (admin_dashboard, True),
+    '/api/attendance': (attendance, False),
+    '/api/leave': (leave, False),
+    '/api/payroll': (payroll, False),
+}
+
+class AsyncReadApp:
+    def __init__(self, flask_app, pool_size=POOL_SIZE, pool_timeout=POOL_TIMEOUT):
+        with flask_app.app_context():
+            url = db.engine.url
+        self.engine = create_async_engine(
+            url.set(drivername='sqlite+aiosqlite'),
+            pool_size=pool_size,
+            max_overflow=0,
+            pool_timeout=pool_timeout
+        )
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        # Read the Flask session cookie exactly as the sync app does
+        self.serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        self.cookie_name = flask_app.config['SESSION_COOKIE_NAME']
+        self.session_max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+
+    def session_user_id(self, headers):
+        cookie = SimpleCookie()
+        for name, value in headers:
+            if name == b'cookie':
+                cookie.load(value.decode('latin-1'))
+        morsel = cookie.get(self.cookie_name)
+        if morsel is None:
+            return None
+        try:
+            return self.serializer.loads(morsel.value, max_age=self.session_max_age).get('user_id')
+        except BadSignature:
+            return None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        route = ROUTES.get(scope['path'])
+        if route is None:
+            await self.respond(send, 404, {'error': 'Not found'})
+            return
+        if scope['method'] != 'GET':
+            await self.respond(send, 405, {'error': 'Method not allowed'})
+            return
+
+        handler, admin_only = route
+        params = {key: values[0] for key, values in parse_qs(scope['query_string'].decode()).items()}
+        user_id = self.session_user_id(scope['headers'])
+
+        async with self.sessionmaker() as session:
+            user = await session.get(User, user_id) if user_id else None
+            denied = check_access(user, admin_only=admin_only)
+            if denied:
+                await self.respond(send, 401 if user is None else 403, {'error': denied[0]})
+                return
+            status, body = await handler(session, user, params)
+
+        await self.respond(send, status, body)
+
+    async def respond(self, send, status, body):
+        payload = json.dumps(body).encode()
+        headers = [(b'content-type', b'application/json'), (b'content-length', str(len(payload)).encode())]
+        if status == 302:
+            headers.append((b'location', body['location'].encode()))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': payload})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+def create_asgi_app(config=None, **pool_options):
+    return AsyncReadApp(create_app(config, web=False), **pool_options)
+
+app = create_asgi_app()
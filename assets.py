@@ -0,0 +1,101 @@
+"""
+Static Assets
+Content-hash fingerprinting and gzip precompression of static files, served with long-lived cache headers
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+from flask import current_app, request, send_from_directory, url_for
+
+BUILD_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+# Folders under static/ that are not build inputs
+SKIP_DIRS = {BUILD_DIR, 'uploads'}
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.html'}
+# One year; fingerprinted URLs change whenever the content does
+IMMUTABLE_MAX_AGE = 31536000
+
+def content_hash(data, length=12):
+    return hashlib.sha256(data).hexdigest()[:length]
+
+def build_assets(static_folder):
+    """Copy every static file to static/dist under a content-hashed name, precompress
+    text assets, and write a manifest mapping original paths to fingerprinted ones"""
+    build_folder = os.path.join(static_folder, BUILD_DIR)
+    manifest = {}
+
+    for root, dirs, files in os.walk(static_folder):
+        if root == static_folder:
+            dirs[:] = [name for name in dirs if name not in SKIP_DIRS]
+        for name in files:
+            if name.startswith('.'):
+                continue
+            source = os.path.join(root, name)
+            relative = os.path.relpath(source, static_folder).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            stem, extension = os.path.splitext(relative)
+            fingerprinted = f"{stem}.{content_hash(data)}{extension}"
+            target = os.path.join(build_folder, fingerprinted)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+
+            # mtime=0 keeps the compressed output identical between builds
+            if extension in COMPRESSIBLE_EXTENSIONS:
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+                if len(compressed) < len(data):
+                    with open(target + '.gz', 'wb') as f:
+                        f.write(compressed)
+
+            manifest[relative] = fingerprinted
+
+    os.makedirs(build_folder, exist_ok=True)
+    with open(os.path.join(build_folder, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def load_manifest(app):
+    """Read the build manifest once per process; an unbuilt tree gets an empty manifest"""
+    manifest = app.extensions.get('asset_manifest')
+    if manifest is None or app.debug:
+        path = os.path.join(app.static_folder, BUILD_DIR, MANIFEST_NAME)
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {}
+        app.extensions['asset_manifest'] = manifest
+    return manifest
+
+def asset_url(filename):
+    """URL of the fingerprinted build of a static file, falling back to the plain static URL"""
+    fingerprinted = load_manifest(current_app).get(filename)
+    if fingerprinted is None:
+        return url_for('static', filename=filename)
+    return url_for('assets', filename=fingerprinted)
+
+def send_immutable(directory, filename):
+    """Send a file whose name changes with its content, preferring a .gz sibling when accepted"""
+    mimetype = mimetypes.guess_type(filename)[0]
+    compressed = filename + '.gz'
+    use_gzip = request.accept_encodings['gzip'] and os.path.isfile(os.path.join(directory, compressed))
+
+    response = send_from_directory(directory, compressed if use_gzip else filename,
+                                   mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+def serve_asset(filename):
+    return send_immutable(os.path.join(current_app.static_folder, BUILD_DIR), filename)
+
+def init_assets(app):
+    app.add_url_rule('/assets/<path:filename>', endpoint='assets', view_func=serve_asset)
+    app.jinja_env.globals['asset_url'] = asset_url
@@ -0,0 +1,85 @@
+"""
+Audit Log
+Captures before/after values of sensitive fields through session events
+"""
+from flask import session, has_request_context
+from sqlalchemy import event, inspect
+from datetime import datetime
+from models import db, User, LeaveRequest, AuditLog
+
+# Fields whose before/after values are recorded in the audit log
+AUDITED_FIELDS = {
+    User: ('first_name', 'last_name', 'phone', 'address', 'department', 'position', 'salary', 'profile_picture'),
+    LeaveRequest: ('status', 'admin_comment'),
+}
+
+def _audit_value(value):
+    return None if value is None else str(value)
+
+def capture_audit_changes(db_session, flush_context, instances):
+    """Buffer before/after values of audited fields; written once at commit"""
+    changed_by = session.get('user_id') if has_request_context() else None
+    changed_at = datetime.now()
+    buffer = db_session.info.setdefault('audit_buffer', [])
+
+    for obj in db_session.dirty:
+        fields = AUDITED_FIELDS.get(type(obj))
+        if not fields:
+            continue
+        state = inspect(obj)
+        for field in fields:
+            history = state.attrs[field].history
+            if not history.has_changes():
+                continue
+            # active_history guarantees the prior value was loaded into committed_state
+            old_value = state.committed_state[field]
+            new_value = history.added[0] if history.added else None
+            if old_value == new_value:
+                continue
+            buffer.append({
+                'entity_type': type(obj).__name__,
+                'entity_id': obj.id,
+                'field': field,
+                'old_value': _audit_value(old_value),
+                'new_value': _audit_value(new_value),
+                'changed_by': changed_by,
+                'changed_at': changed_at
+            })
+
+def write_audit_buffer(db_session):
+    """Write the buffered audit rows with one multi-row insert inside the committing transaction"""
+    db_session.flush()
+    rows = db_session.info.pop('audit_buffer', None)
+    if rows:
+        db_session.execute(AuditLog.__table__.insert(), rows)
+
+def discard_audit_buffer(db_session):
+    db_session.info.pop('audit_buffer', None)
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+def register_audit_listeners(db_session):
+    """Attach the audit listeners to a session (safe to call more than once)"""
+    # Without active_history an expired attribute is overwritten without loading its old value
+    for model, fields in AUDITED_FIELDS.items():
+        for field in fields:
+            attribute = getattr(model, field)
+            if not event.contains(attribute, 'set', _load_previous_value):
+                event.listen(attribute, 'set', _load_previous_value, active_history=True)
+    for name, listener in (('before_flush', capture_audit_changes),
+                           ('before_commit', write_audit_buffer),
+                           ('after_rollback', discard_audit_buffer)):
+        if not event.contains(db_session, name, listener):
+            event.listen(db_session, name, listener)
+
+def stream_audit_log(start, end, batch_size=1000):
+    """Yield audit rows in a time range in batches, reading only the audit table"""
+    result = db.session.execute(
+        db.select(AuditLog.__table__)
+        .where(AuditLog.changed_at >= start, AuditLog.changed_at < end)
+        .order_by(AuditLog.changed_at, AuditLog.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in result.partitions():
+        yield from partition
@@ -0,0 +1,17 @@
+"""
+Access Rules
+Role checks shared by the sync views and the async read path
+"""
+
+ADMIN_ROLE = 'HR'
+
+def is_admin(user):
+    return user is not None and user.role == ADMIN_ROLE
+
+def check_access(user, admin_only=False):
+    """Return None when the user may proceed, otherwise (message, category, redirect endpoint)"""
+    if user is None:
+        return ('Please log in to access this page.', 'warning', 'signin')
+    if admin_only and not is_admin(user):
+        return ('Access denied. Admin privileges required.', 'danger', 'employee_dashboard')
+    return None
@@ -0,0 +1,175 @@
+"""
+Concurrency Load Test
+Compares the WSGI app on a fixed pool of worker threads with the async read path by
+ramping up kiosk-style clients (each polling the attendance view, reusing its connection
+when the server allows keep-alive) and reporting the most clients each mode sustains
+within a p99 budget.
+Both modes are measured on the same /api/attendance JSON built from the same query; the
+WSGI /attendance HTML page is measured too, to show the added template rendering cost.
+
+Seed the database first (python seed_database.py), then run: python bench_async.py
+"""
+import asyncio
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+
+HOST = '127.0.0.1'
+WSGI_PORT = 8101
+ASGI_PORT = 8102
+WSGI_THREADS = 16
+P99_BUDGET_MS = 250
+CLIENT_STEPS = [8, 16, 32, 64, 128, 256]
+STEP_SECONDS = 5
+POLL_INTERVAL = 0.2
+LOGIN = {'email': 'admin@dayflow.com', 'password': 'admin123'}
+
+def serve_wsgi(port, threads):
+    """Serve the Flask app with each connection handled on a fixed pool of threads"""
+    from concurrent.futures import ThreadPoolExecutor
+    from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+    from app import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log(self, type, message, *args):
+            pass
+
+    class PooledWSGIServer(BaseWSGIServer):
+        multithread = True
+
+        def __init__(self, host, port, app):
+            super().__init__(host, port, app, handler=QuietHandler)
+            self.executor = ThreadPoolExecutor(threads)
+
+        def process_request(self, request, client_address):
+            self.executor.submit(self.handle_connection, request, client_address)
+
+        def handle_connection(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    QuietHandler.protocol_version = 'HTTP/1.1'
+    PooledWSGIServer(HOST, port, create_app()).serve_forever()
+
+async def http_request(reader, writer, method, path, headers=None, body=b''):
+    """Send one HTTP/1.1 request on an open connection and return (status, headers, body)"""
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {HOST}", f"Content-Length: {len(body)}"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+    await writer.drain()
+
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    response_headers = {}
+    for line in header_lines:
+        if line:
+            name, value = line.split(':', 1)
+            response_headers.setdefault(name.strip().lower(), []).append(value.strip())
+    length = int(response_headers.get('content-length', ['0'])[0])
+    return int(status_line.split()[1]), response_headers, await reader.readexactly(length)
+
+async def login(port):
+    """Sign in through the WSGI app and return the session cookie"""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    body = urlencode(LOGIN).encode()
+    status, headers, _ = await http_request(reader, writer, 'POST', '/signin',
+                                            {'Content-Type': 'application/x-www-form-urlencoded'}, body)
+    writer.close()
+    for cookie in headers.get('set-cookie', []):
+        if cookie.startswith('session='):
+            return cookie.split(';', 1)[0]
+    raise RuntimeError(f"Login failed with status {status}")
+
+async def kiosk(port, path, cookie, deadline, latencies, errors):
+    """One client: poll until the deadline, keeping the connection open unless the server closes it"""
+    connection = None
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if connection is None:
+                connection = await asyncio.wait_for(asyncio.open_connection(HOST, port), STEP_SECONDS)
+            reader, writer = connection
+            status, headers, _ = await asyncio.wait_for(
+                http_request(reader, writer, 'GET', path, {'Cookie': cookie}), STEP_SECONDS * 2)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors.append(status)
+            if 'close' in headers.get('connection', []):
+                writer.close()
+                connection = None
+            await asyncio.sleep(POLL_INTERVAL)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        errors.append('timeout')
+    finally:
+        if connection is not None:
+            connection[1].close()
+
+async def run_step(port, path, cookie, clients):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + STEP_SECONDS
+    await asyncio.gather(*(kiosk(port, path, cookie, deadline, latencies, errors) for _ in range(clients)))
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else float('inf')
+    return p99, len(latencies) / STEP_SECONDS, len(errors)
+
+async def wait_for_port(port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(HOST, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+async def measure_mode(name, port, path, cookie):
+    print(f"\n{name}: GET {path}")
+    sustained = 0
+    for clients in CLIENT_STEPS:
+        p99, throughput, errors = await run_step(port, path, cookie, clients)
+        ok = p99 <= P99_BUDGET_MS and not errors
+        print(f"  {clients:4d} clients  p99 {p99:9.1f} ms  {throughput:7.1f} req/s  {errors} errors  {'OK' if ok else 'OVER'}")
+        if not ok:
+            break
+        sustained = clients
+    return sustained
+
+async def main():
+    servers = [
+        subprocess.Popen([sys.executable, __file__, 'serve-wsgi', str(WSGI_PORT), str(WSGI_THREADS)]),
+        subprocess.Popen([sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', HOST,
+                          '--port', str(ASGI_PORT), '--log-level', 'warning']),
+    ]
+    try:
+        await wait_for_port(WSGI_PORT)
+        await wait_for_port(ASGI_PORT)
+        cookie = await login(WSGI_PORT)
+        # Same JSON payload on both servers, plus the HTML page for reference
+        results = {
+            f"WSGI JSON ({WSGI_THREADS} threads)": await measure_mode(
+                f"WSGI JSON ({WSGI_THREADS} threads)", WSGI_PORT, '/api/attendance?view=weekly', cookie),
+            'Async JSON': await measure_mode(
+                'Async JSON', ASGI_PORT, '/api/attendance?view=weekly', cookie),
+            f"WSGI HTML ({WSGI_THREADS} threads)": await measure_mode(
+                f"WSGI HTML ({WSGI_THREADS} threads)", WSGI_PORT, '/attendance?view=weekly', cookie),
+        }
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+
+    print(f"\nMost concurrent clients within p99 {P99_BUDGET_MS} ms:")
+    for name, clients in results.items():
+        print(f"  {name:<26} {clients}")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == 'serve-wsgi':
+        serve_wsgi(int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        asyncio.run(main())
@@ -0,0 +1,64 @@
+"""
+Template Rendering Benchmark
+Renders the payroll page for a large synthetic employee list with the fragment cache
+disabled, cold and warm, and reports render times and the cache hit rate
+"""
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from flask import render_template
+from app import create_app
+
+ROWS = 5000
+RUNS = 5
+
+def make_employees(count):
+    return [
+        SimpleNamespace(
+            id=i,
+            employee_id=f"EMP{i:05d}",
+            first_name="Employee",
+            last_name=str(i),
+            department="Engineering",
+            position="Engineer",
+            salary=50000.0 + i,
+            updated_at=datetime(2026, 1, 1)
+        )
+        for i in range(1, count + 1)
+    ]
+
+def best_render_time(app, employees):
+    user = SimpleNamespace(role='HR')
+    best = None
+    for _ in range(RUNS):
+        with app.test_request_context('/payroll'):
+            start = time.perf_counter()
+            render_template('payroll.html', user=user, employees=employees, is_admin=True)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+def main():
+    app = create_app({'SCHEMA_CHECK_ON_START': False})
+    employees = make_employees(ROWS)
+    cache = app.extensions['fragment_cache']
+
+    app.config['FRAGMENT_CACHE_ENABLED'] = False
+    uncached = best_render_time(app, employees)
+
+    app.config['FRAGMENT_CACHE_ENABLED'] = True
+    cache.clear()
+    with app.test_request_context('/payroll'):
+        start = time.perf_counter()
+        render_template('payroll.html', user=SimpleNamespace(role='HR'), employees=employees, is_admin=True)
+        cold = (time.perf_counter() - start) * 1000
+    warm = best_render_time(app, employees)
+
+    print(f"Payroll page, {ROWS} rows")
+    print(f"  no fragment cache   {uncached:8.1f} ms")
+    print(f"  cold fragment cache {cold:8.1f} ms")
+    print(f"  warm fragment cache {warm:8.1f} ms")
+    print(f"  cache stats         {cache.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Attendance Calendars
+Maintains the compact per-user yearly attendance arrays
+"""
+from sqlalchemy import text
+from models import db, Attendance, AttendanceCalendar, CALENDAR_STATUS_CODES, CALENDAR_DAYS
+
+# Each day is written as one byte spliced into the stored array by SQLite itself, so
+# concurrent writers for the same user and year never overwrite each other's days
+CREATE_CALENDAR_SQL = text("""
+    INSERT OR IGNORE INTO attendance_calendar (user_id, year, days)
+    VALUES (:user_id, :year, zeroblob(:size))
+""")
+
+SET_CALENDAR_DAY_SQL = text("""
+    UPDATE attendance_calendar
+    SET days = CAST(substr(days, 1, :offset) || :code || substr(days, :offset + 2) AS BLOB)
+    WHERE user_id = :user_id AND year = :year
+""")
+
+def mark_calendar_day(user_id, day, status):
+    """Record the status of a single day in the user's yearly calendar (caller commits)"""
+    mark_calendar_rows([(user_id, day, status)])
+
+def mark_calendar_days(user_id, days, status):
+    """Record the same status for several days of one user (caller commits)"""
+    mark_calendar_rows([(user_id, day, status) for day in days])
+
+def mark_calendar_rows(rows):
+    """Record many (user_id, day, status) rows, creating missing yearly calendars first (caller commits)"""
+    updates = [
+        {
+            'user_id': user_id,
+            'year': day.year,
+            'offset': day.timetuple().tm_yday - 1,
+            'code': bytes([CALENDAR_STATUS_CODES[status]])
+        }
+        for user_id, day, status in rows
+    ]
+    if not updates:
+        return
+    calendars = {(update['user_id'], update['year']) for update in updates}
+    db.session.execute(CREATE_CALENDAR_SQL, [
+        {'user_id': user_id, 'year': year, 'size': CALENDAR_DAYS} for user_id, year in calendars
+    ])
+    db.session.execute(SET_CALENDAR_DAY_SQL, updates)
+
+def rebuild_attendance_calendar():
+    """Rebuild every yearly calendar from the Attendance table (caller commits)"""
+    db.session.query(AttendanceCalendar).delete()
+
+    calendars = {}
+    rows = db.session.query(Attendance.user_id, Attendance.date, Attendance.status).all()
+    for user_id, day, status in rows:
+        code = CALENDAR_STATUS_CODES.get(status)
+        if code is None:
+            continue
+        key = (user_id, day.year)
+        if key not in calendars:
+            calendars[key] = bytearray(CALENDAR_DAYS)
+        calendars[key][day.timetuple().tm_yday - 1] = code
+
+    db.session.add_all([
+        AttendanceCalendar(user_id=user_id, year=year, days=bytes(days_array))
+        for (user_id, year), days_array in calendars.items()
+    ])
+    return len(calendars)
+
+def calendar_grid(user_ids, year):
+    """Return a (len(user_ids), 366) uint8 array of status codes for the given year"""
+    import numpy as np
+
+    grid = np.zeros((len(user_ids), CALENDAR_DAYS), dtype=np.uint8)
+    if not user_ids:
+        return grid
+    row_index = {user_id: i for i, user_id in enumerate(user_ids)}
+    calendars = db.session.query(AttendanceCalendar.user_id, AttendanceCalendar.days).filter(
+        AttendanceCalendar.year == year,
+        AttendanceCalendar.user_id.in_(user_ids)
+    ).all()
+    for user_id, days in calendars:
+        grid[row_index[user_id]] = np.frombuffer(days, dtype=np.uint8)
+    return grid
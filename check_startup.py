@@ -0,0 +1,53 @@
+"""
+Startup Budget Check
+Measures import time, app creation time and first-request latency in a fresh interpreter
+and exits non-zero when any of them is over budget
+"""
+import json
+import subprocess
+import sys
+
+# Budgets in milliseconds
+BUDGETS = {
+    'import': 600,
+    'create_app': 150,
+    'first_request': 250,
+}
+
+MEASURE_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app()
+created = time.perf_counter()
+response = flask_app.test_client().get('/signin')
+requested = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    'import': (imported - start) * 1000,
+    'create_app': (created - imported) * 1000,
+    'first_request': (requested - created) * 1000,
+}))
+"""
+
+def measure(runs=5):
+    """Run the measurement in fresh interpreters and keep the best time for each phase"""
+    best = {}
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', MEASURE_SCRIPT], capture_output=True, text=True, check=True).stdout
+        for phase, elapsed in json.loads(output.strip().splitlines()[-1]).items():
+            best[phase] = min(elapsed, best.get(phase, elapsed))
+    return best
+
+def main():
+    timings = measure()
+    over_budget = False
+    for phase, budget in BUDGETS.items():
+        status = 'OK' if timings[phase] <= budget else 'OVER'
+        over_budget = over_budget or status == 'OVER'
+        print(f"{phase:<15} {timings[phase]:8.1f} ms  (budget {budget} ms)  {status}")
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+CLI Commands
+Maintenance commands, registered on the app by create_app() and run with `flask --app app <command>`
+"""
+import csv
+import sys
+import click
+from flask import current_app
+from datetime import date, timedelta
+from models import db, Holiday, ensure_schema
+from calendars import mark_calendar_rows, rebuild_attendance_calendar
+from audit import stream_audit_log
+from absences import mark_absences, date_chunks
+
+@click.command('init-db')
+def init_db_command():
+    """Create missing tables and record the schema version"""
+    if ensure_schema():
+        print("Database schema created")
+    else:
+        print("Database schema is up to date")
+
+@click.command('rebuild-calendar')
+def rebuild_calendar_command():
+    """Rebuild the yearly attendance calendars from existing attendance records"""
+    ensure_schema()
+    count = rebuild_attendance_calendar()
+    db.session.commit()
+    print(f"Rebuilt {count} attendance calendars")
+
+@click.command('mark-absences')
+@click.option('--start', 'start_date', type=click.DateTime(formats=['%Y-%m-%d']), help='First day to mark (defaults to yesterday)')
+@click.option('--end', 'end_date', type=click.DateTime(formats=['%Y-%m-%d']), help='Last day to mark (defaults to --start)')
+@click.option('--chunk-days', type=click.IntRange(min=1), default=31, show_default=True, help='Days per transaction when backfilling')
+def mark_absences_command(start_date, end_date, chunk_days):
+    """Mark Absent for employees with no attendance on a past working day (run nightly)"""
+    # Default to the day that just ended so a run shortly after midnight is still correct
+    start_date = start_date.date() if start_date else date.today() - timedelta(days=1)
+    end_date = end_date.date() if end_date else start_date
+    if end_date < start_date:
+        raise click.BadParameter('End date must be after start date.')
+    if end_date >= date.today():
+        raise click.BadParameter('Only days that have already ended can be marked.')
+
+    ensure_schema()
+    total = 0
+    for chunk_start, chunk_end in date_chunks(start_date, end_date, chunk_days):
+        marked = mark_absences(db.session, chunk_start, chunk_end)
+        mark_calendar_rows([(user_id, day, 'Absent') for user_id, day in marked])
+        db.session.commit()
+        total += len(marked)
+        print(f"{chunk_start} to {chunk_end}: marked {len(marked)} absences")
+    print(f"Marked {total} absences")
+
+@click.command('export-audit')
+@click.option('--start', 'start_date', type=click.DateTime(formats=['%Y-%m-%d']), required=True, help='First day to export')
+@click.option('--end', 'end_date', type=click.DateTime(formats=['%Y-%m-%d']), required=True, help='Last day to export')
+def export_audit_command(start_date, end_date):
+    """Stream audit log entries in a date range to stdout as CSV"""
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['changed_at', 'entity_type', 'entity_id', 'field', 'old_value', 'new_value', 'changed_by'])
+    for row in stream_audit_log(start_date, end_date + timedelta(days=1)):
+        writer.writerow([row.changed_at.isoformat(), row.entity_type, row.entity_id, row.field,
+                         row.old_value, row.new_value, row.changed_by])
+
+@click.command('add-holiday')
+@click.argument('holiday_date', type=click.DateTime(formats=['%Y-%m-%d']))
+@click.argument('name')
+def add_holiday_command(holiday_date, name):
+    """Add a day to the holiday calendar so it is never marked Absent"""
+    ensure_schema()
+    holiday_date = holiday_date.date()
+    if Holiday.query.filter_by(date=holiday_date).first():
+        print(f"{holiday_date} is already a holiday")
+        return
+    db.session.add(Holiday(date=holiday_date, name=name))
+    db.session.commit()
+    print(f"Added holiday {name} on {holiday_date}")
+
+@click.command('compile-templates')
+def compile_templates_command():
+    """Compile every template into the Jinja bytecode cache so new workers start warm"""
+    jinja_env = current_app.jinja_env
+    names = jinja_env.list_templates()
+    for name in names:
+        jinja_env.get_template(name)
+    print(f"Compiled {len(names)} templates")
+
+@click.command('build-assets')
+def build_assets_command():
+    """Fingerprint and precompress static files into static/dist"""
+    from assets import build_assets
+    manifest = build_assets(current_app.static_folder)
+    print(f"Built {len(manifest)} static assets")
+
+def register_commands(app):
+    for command in (init_db_command, rebuild_calendar_command, mark_absences_command,
+                    export_audit_command, add_holiday_command, compile_templates_command, build_assets_command):
+        app.cli.add_command(command)
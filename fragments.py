@@ -0,0 +1,69 @@
+"""
+Template Fragment Cache
+Bounded LRU cache for rendered template fragments, keyed by entity id and version
+"""
+from collections import OrderedDict
+from threading import Lock
+from markupsafe import Markup
+
+class FragmentCache:
+    """Thread-safe LRU of rendered fragments with hit/miss counters"""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fragments = OrderedDict()
+        self._lock = Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        fragment = Markup(render())
+        with self._lock:
+            self._fragments[key] = fragment
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.maxsize:
+                self._fragments.popitem(last=False)
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._fragments),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+def init_fragment_cache(app):
+    """Expose the cache to templates as a call block:
+
+        {% call cache_fragment('payroll_row', employee.id, employee.updated_at) %}...{% endcall %}
+
+    The body is rendered only when no fragment is cached for that name, id and version.
+    """
+    cache = FragmentCache(app.config['FRAGMENT_CACHE_SIZE'])
+    app.extensions['fragment_cache'] = cache
+
+    def cache_fragment(name, entity_id, version, *variant, caller):
+        if not app.config['FRAGMENT_CACHE_ENABLED']:
+            return caller()
+        return cache.get_or_render((name, entity_id, version) + variant, caller)
+
+    app.jinja_env.globals['cache_fragment'] = cache_fragment
+    return cache
@@ -0,0 +1,133 @@
+"""
+Database Models
+SQLAlchemy models shared by the web app, CLI commands and scripts
+"""
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
+from datetime import datetime
+
+db = SQLAlchemy()
+
+# Bump when models change so existing databases get new tables on next start
+SCHEMA_VERSION = 3
+
+# Columns added to tables that already existed, as (table, column, SQL type)
+ADDED_COLUMNS = [
+    ('user', 'updated_at', 'DATETIME'),
+]
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.String(50), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password = db.Column(db.String(255), nullable=False)
+    role = db.Column(db.String(20), nullable=False)  # 'Employee' or 'HR'
+    first_name = db.Column(db.String(50))
+    last_name = db.Column(db.String(50))
+    phone = db.Column(db.String(20))
+    address = db.Column(db.Text)
+    department = db.Column(db.String(50))
+    position = db.Column(db.String(50))
+    hire_date = db.Column(db.Date)
+    salary = db.Column(db.Float)
+    profile_picture = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    # Relationships
+    attendance_records = db.relationship('Attendance', backref='user', lazy=True)
+    leave_requests = db.relationship('LeaveRequest', backref='user', lazy=True)
+
+class Attendance(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    check_in = db.Column(db.Time)
+    check_out = db.Column(db.Time)
+    status = db.Column(db.String(20), nullable=False)  # Present, Absent, Half-day, Leave
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'date', name='unique_user_date'),
+        # Covers the analytics scan so it never has to visit the table rows
+        db.Index('ix_attendance_user_times', 'user_id', 'date', 'check_in', 'check_out'),
+    )
+
+# One byte per day of the year, indexed by (day of year - 1)
+CALENDAR_STATUS_CODES = {'Present': 1, 'Absent': 2, 'Half-day': 3, 'Leave': 4}
+CALENDAR_DAYS = 366
+
+class AttendanceCalendar(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    days = db.Column(db.LargeBinary(CALENDAR_DAYS), nullable=False)
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'year', name='unique_user_year'),)
+
+class Holiday(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, unique=True, nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+
+class LeaveRequest(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    leave_type = db.Column(db.String(50), nullable=False)  # Paid, Sick, Unpaid
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    remarks = db.Column(db.Text)
+    status = db.Column(db.String(20), default='Pending')  # Pending, Approved, Rejected
+    admin_comment = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+class AuditLog(db.Model):
+    # Append-only: rows are only ever inserted, never updated or deleted
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(50), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    field = db.Column(db.String(50), nullable=False)
+    old_value = db.Column(db.Text)
+    new_value = db.Column(db.Text)
+    changed_by = db.Column(db.Integer)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    __table_args__ = (
+        db.Index('ix_audit_log_entity', 'entity_type', 'entity_id', 'changed_at'),
+        db.Index('ix_audit_log_changed_at', 'changed_at'),
+    )
+
+def enable_wal(dbapi_connection, connection_record):
+    # WAL lets long reads (e.g. streaming the audit log) run without blocking writes to live tables
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.close()
+
+def configure_engine(engine):
+    if engine.dialect.name == 'sqlite' and not event.contains(engine, 'connect', enable_wal):
+        event.listen(engine, 'connect', enable_wal)
+
+def ensure_schema():
+    """Create missing tables once per schema version instead of on every worker start"""
+    with db.engine.connect() as connection:
+        version = connection.exec_driver_sql('PRAGMA user_version').scalar()
+    if version == SCHEMA_VERSION:
+        return False
+    new_tables = set(db.metadata.tables) - set(inspect(db.engine).get_table_names())
+    db.create_all()
+    if 'attendance_calendar' in new_tables:
+        # Upgraded databases already have attendance history to fill the new calendars from
+        from calendars import rebuild_attendance_calendar
+        rebuild_attendance_calendar()
+        db.session.commit()
+    with db.engine.begin() as connection:
+        # create_all() skips indexes on tables that already exist
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+        for table, column, column_type in ADDED_COLUMNS:
+            existing = {row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table}")')}
+            if column not in existing:
+                connection.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN {column} {column_type}')
+        connection.exec_driver_sql(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    return True
@@ -0,0 +1,38 @@
+"""
+JSON Payloads
+Serializers for the JSON read endpoints, shared by the sync and async paths
+"""
+
+def user_json(user):
+    return {
+        'id': user.id,
+        'employee_id': user.employee_id,
+        'name': f"{user.first_name} {user.last_name}",
+        'department': user.department,
+        'position': user.position,
+    }
+
+def attendance_json(record):
+    return {
+        'id': record.id,
+        'user_id': record.user_id,
+        'employee': f"{record.user.first_name} {record.user.last_name}",
+        'date': record.date.isoformat(),
+        'check_in': record.check_in.strftime('%H:%M') if record.check_in else None,
+        'check_out': record.check_out.strftime('%H:%M') if record.check_out else None,
+        'status': record.status,
+    }
+
+def leave_json(leave):
+    return {
+        'id': leave.id,
+        'user_id': leave.user_id,
+        'employee': f"{leave.user.first_name} {leave.user.last_name}",
+        'leave_type': leave.leave_type,
+        'start_date': leave.start_date.isoformat(),
+        'end_date': leave.end_date.isoformat(),
+        'days': (leave.end_date - leave.start_date).days + 1,
+        'remarks': leave.remarks,
+        'status': leave.status,
+        'admin_comment': leave.admin_comment,
+    }
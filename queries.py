@@ -0,0 +1,63 @@
+"""
+Read Queries
+Role-scoped select() statements for the read-heavy pages, executed by both the
+sync views (db.session) and the async read path (AsyncSession)
+"""
+from datetime import datetime, date, timedelta
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload
+from auth import is_admin
+from models import User, Attendance, LeaveRequest
+
+def parse_date(value, default):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return default
+
+def recent_attendance_query(user=None, limit=10):
+    """Latest attendance records, for one employee or (user=None) everyone"""
+    query = select(Attendance).options(joinedload(Attendance.user)).order_by(Attendance.date.desc()).limit(limit)
+    if user is not None:
+        query = query.where(Attendance.user_id == user.id)
+    return query
+
+def pending_leave_count_query(user=None):
+    query = select(func.count()).select_from(LeaveRequest).where(LeaveRequest.status == 'Pending')
+    if user is not None:
+        query = query.where(LeaveRequest.user_id == user.id)
+    return query
+
+def employees_query():
+    return select(User).where(User.role == 'Employee')
+
+def attendance_query(user, view_type, selected_date=None):
+    """Attendance for the current week or one day; employees only see their own records"""
+    query = select(Attendance).options(joinedload(Attendance.user))
+    if view_type == 'weekly':
+        today = date.today()
+        start_of_week = today - timedelta(days=today.weekday())
+        end_of_week = start_of_week + timedelta(days=6)
+        query = query.where(
+            Attendance.date >= start_of_week,
+            Attendance.date <= end_of_week
+        ).order_by(Attendance.date.desc())
+    else:
+        query = query.where(Attendance.date == (selected_date or date.today()))
+
+    if not is_admin(user):
+        query = query.where(Attendance.user_id == user.id)
+    return query
+
+def leave_requests_query(user):
+    """All leave requests for HR, otherwise the user's own"""
+    query = select(LeaveRequest).options(joinedload(LeaveRequest.user)).order_by(LeaveRequest.created_at.desc())
+    if not is_admin(user):
+        query = query.where(LeaveRequest.user_id == user.id)
+    return query
+
+def payroll_query(user):
+    """Every employee for HR, otherwise just the user (read-only)"""
+    if is_admin(user):
+        return employees_query()
+    return select(User).where(User.id == user.id)
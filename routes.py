@@ -0,0 +1,571 @@
+"""
+Routes
+View functions for the web app, registered on the app by create_app()
+"""
+from flask import current_app, render_template, request, redirect, url_for, flash, session, jsonify
+from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.utils import secure_filename
+from datetime import datetime, date, timedelta
+import os
+from functools import wraps
+from models import db, User, Attendance, AttendanceCalendar, LeaveRequest, AuditLog, CALENDAR_STATUS_CODES, CALENDAR_DAYS
+from calendars import mark_calendar_day, mark_calendar_days, calendar_grid
+from assets import content_hash, send_immutable
+from auth import check_access, is_admin
+from payloads import attendance_json
+from queries import (parse_date, recent_attendance_query, pending_leave_count_query, employees_query,
+                     attendance_query, leave_requests_query, payroll_query)
+
+ROUTES = []
+
+# Employees per page on the attendance report
+REPORT_PAGE_SIZE = 100
+
+def route(rule, **options):
+    """Collect a view function to be registered by register_routes()"""
+    def decorator(f):
+        ROUTES.append((rule, f, options))
+        return f
+    return decorator
+
+def register_routes(app):
+    for rule, view_func, options in ROUTES:
+        app.add_url_rule(rule, view_func=view_func, **options)
+
+def save_upload(file, filename):
+    """Save an upload under a content-hashed name (so it can be cached as immutable) and return that name"""
+    data = file.read()
+    stem, extension = os.path.splitext(filename)
+    filename = f"{stem}.{content_hash(data)}{extension}"
+
+    # Upload folder is created on first use rather than at startup
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_folder, exist_ok=True)
+    with open(os.path.join(upload_folder, filename), 'wb') as f:
+        f.write(data)
+    return filename
+
+@route('/uploads/<path:filename>')
+def uploaded_file(filename):
+    return send_immutable(current_app.config['UPLOAD_FOLDER'], filename)
+
+# Decorator for login required
+def login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            flash('Please log in to access this page.', 'warning')
+            return redirect(url_for('signin'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+# Decorator for admin required
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            flash('Please log in to access this page.', 'warning')
+            return redirect(url_for('signin'))
+        user = User.query.get(session['user_id'])
+        denied = check_access(user, admin_only=True)
+        if denied:
+            message, category, endpoint = denied
+            flash(message, category)
+            return redirect(url_for(endpoint))
+        return f(*args, **kwargs)
+    return decorated_function
+
+# Routes
+@route('/')
+def index():
+    if 'user_id' in session:
+        user = User.query.get(session['user_id'])
+        if user.role == 'HR':
+            return redirect(url_for('admin_dashboard'))
+        else:
+            return redirect(url_for('employee_dashboard'))
+    return redirect(url_for('signin'))
+
+@route('/signup', methods=['GET', 'POST'])
+def signup():
+    if request.method == 'POST':
+        employee_id = request.form.get('employee_id')
+        email = request.form.get('email')
+        password = request.form.get('password')
+        confirm_password = request.form.get('confirm_password')
+        role = request.form.get('role')
+        first_name = request.form.get('first_name')
+        last_name = request.form.get('last_name')
+        phone = request.form.get('phone')
+        address = request.form.get('address')
+        department = request.form.get('department')
+        position = request.form.get('position')
+        hire_date_str = request.form.get('hire_date')
+        
+        # Validation
+        if not all([employee_id, email, password, role, first_name, last_name, department, position, hire_date_str]):
+            flash('All required fields must be filled.', 'danger')
+            return render_template('signup.html')
+        
+        if password != confirm_password:
+            flash('Passwords do not match.', 'danger')
+            return render_template('signup.html')
+        
+        if len(password) < 8:
+            flash('Password must be at least 8 characters long.', 'danger')
+            return render_template('signup.html')
+        
+        # Check if user exists
+        if User.query.filter_by(employee_id=employee_id).first():
+            flash('Employee ID already exists.', 'danger')
+            return render_template('signup.html')
+        
+        if User.query.filter_by(email=email).first():
+            flash('Email already registered.', 'danger')
+            return render_template('signup.html')
+        
+        # Parse hire date
+        try:
+            hire_date = datetime.strptime(hire_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            flash('Invalid hire date format.', 'danger')
+            return render_template('signup.html')
+        
+        # Create user
+        hashed_password = generate_password_hash(password)
+        user = User(
+            employee_id=employee_id,
+            email=email,
+            password=hashed_password,
+            role=role,
+            first_name=first_name,
+            last_name=last_name,
+            phone=phone if phone else None,
+            address=address if address else None,
+            department=department,
+            position=position,
+            hire_date=hire_date
+        )
+        
+        # Handle profile picture upload
+        if 'profile_picture' in request.files:
+            file = request.files['profile_picture']
+            if file and file.filename:
+                filename = secure_filename(f"{employee_id}_{file.filename}")
+                user.profile_picture = save_upload(file, filename)
+        
+        db.session.add(user)
+        db.session.commit()
+        
+        flash('Registration successful! Please log in.', 'success')
+        return redirect(url_for('signin'))
+    
+    return render_template('signup.html')
+
+@route('/signin', methods=['GET', 'POST'])
+def signin():
+    if request.method == 'POST':
+        email = request.form.get('email')
+        password = request.form.get('password')
+        
+        user = User.query.filter_by(email=email).first()
+        
+        if user and check_password_hash(user.password, password):
+            session['user_id'] = user.id
+            session['role'] = user.role
+            flash(f'Welcome back, {user.first_name or user.email}!', 'success')
+            
+            if user.role == 'HR':
+                return redirect(url_for('admin_dashboard'))
+            else:
+                return redirect(url_for('employee_dashboard'))
+        else:
+            flash('Invalid email or password.', 'danger')
+    
+    return render_template('signin.html')
+
+@route('/logout')
+def logout():
+    session.clear()
+    flash('You have been logged out.', 'info')
+    return redirect(url_for('signin'))
+
+@route('/employee/dashboard')
+@login_required
+def employee_dashboard():
+    user = User.query.get(session['user_id'])
+    if user.role == 'HR':
+        return redirect(url_for('admin_dashboard'))
+    
+    # Get recent attendance
+    recent_attendance = db.session.scalars(recent_attendance_query(user, limit=5)).all()
+    
+    # Get pending leave requests
+    pending_leaves = db.session.scalar(pending_leave_count_query(user))
+    
+    return render_template('employee_dashboard.html', user=user, recent_attendance=recent_attendance, pending_leaves=pending_leaves)
+
+@route('/admin/dashboard')
+@admin_required
+def admin_dashboard():
+    # Get all employees
+    employees = db.session.scalars(employees_query()).all()
+    
+    # Get recent attendance records
+    recent_attendance = db.session.scalars(recent_attendance_query(limit=10)).all()
+    
+    # Get pending leave requests
+    pending_leaves = db.session.scalar(pending_leave_count_query())
+    
+    return render_template('admin_dashboard.html', employees=employees, recent_attendance=recent_attendance, pending_leaves=pending_leaves)
+
+@route('/profile')
+@login_required
+def profile():
+    user_id = request.args.get('user_id')
+    current_user = User.query.get(session['user_id'])
+    
+    # Admin can view any employee profile, employees can only view their own
+    if user_id and current_user.role == 'HR':
+        user = User.query.get_or_404(user_id)
+    else:
+        user = current_user
+    
+    return render_template('profile.html', user=user, current_user=current_user)
+
+@route('/profile/edit', methods=['GET', 'POST'])
+@login_required
+def edit_profile():
+    user_id = request.args.get('user_id')
+    current_user = User.query.get(session['user_id'])
+    
+    # Admin can edit any employee profile, employees can only edit their own
+    if user_id and current_user.role == 'HR':
+        user = User.query.get_or_404(user_id)
+    else:
+        user = current_user
+    
+    if request.method == 'POST':
+        # Employees can edit limited fields
+        if user.role == 'Employee' and user.id == session['user_id']:
+            user.phone = request.form.get('phone')
+            user.address = request.form.get('address')
+        elif current_user.role == 'HR':
+            # Admin can edit all fields
+            user.first_name = request.form.get('first_name')
+            user.last_name = request.form.get('last_name')
+            user.phone = request.form.get('phone')
+            user.address = request.form.get('address')
+            user.department = request.form.get('department')
+            user.position = request.form.get('position')
+            if request.form.get('salary'):
+                try:
+                    user.salary = float(request.form.get('salary'))
+                except ValueError:
+                    pass
+        
+        # Handle profile picture upload
+        if 'profile_picture' in request.files:
+            file = request.files['profile_picture']
+            if file and file.filename:
+                filename = secure_filename(f"{user.id}_{file.filename}")
+                user.profile_picture = save_upload(file, filename)
+        
+        db.session.commit()
+        flash('Profile updated successfully!', 'success')
+        if user_id and current_user.role == 'HR':
+            return redirect(url_for('profile', user_id=user_id))
+        return redirect(url_for('profile'))
+    
+    return render_template('edit_profile.html', user=user, current_user=current_user)
+
+@route('/attendance')
+@login_required
+def attendance():
+    user = User.query.get(session['user_id'])
+    view_type = request.args.get('view', 'daily')
+    selected_date = parse_date(request.args.get('date'), date.today())
+    attendance_records = db.session.scalars(attendance_query(user, view_type, selected_date)).all()
+    
+    return render_template('attendance.html', user=user, attendance_records=attendance_records, view_type=view_type)
+
+@route('/api/attendance')
+@login_required
+def attendance_api():
+    # Sync counterpart of the async read path's /api/attendance, with the same payload
+    user = User.query.get(session['user_id'])
+    view_type = request.args.get('view', 'daily')
+    selected_date = parse_date(request.args.get('date'), date.today())
+    records = db.session.scalars(attendance_query(user, view_type, selected_date)).all()
+    return jsonify({
+        'view': view_type,
+        'attendance_records': [attendance_json(record) for record in records],
+    })
+
+@route('/attendance/checkin', methods=['POST'])
+@login_required
+def checkin():
+    user = User.query.get(session['user_id'])
+    if user.role == 'HR':
+        flash('Admins cannot check in.', 'warning')
+        return redirect(url_for('attendance'))
+    
+    today = date.today()
+    attendance = Attendance.query.filter_by(user_id=user.id, date=today).first()
+    
+    if attendance and attendance.status == 'Absent':
+        # A day marked Absent before the employee arrived becomes Present
+        attendance.check_in = datetime.now().time()
+        attendance.status = 'Present'
+        mark_calendar_day(user.id, today, 'Present')
+        db.session.commit()
+        flash('Check-in successful!', 'success')
+    elif attendance:
+        flash('You have already checked in today.', 'warning')
+    else:
+        attendance = Attendance(
+            user_id=user.id,
+            date=today,
+            check_in=datetime.now().time(),
+            status='Present'
+        )
+        db.session.add(attendance)
+        mark_calendar_day(user.id, today, 'Present')
+        db.session.commit()
+        flash('Check-in successful!', 'success')
+    
+    return redirect(url_for('attendance'))
+
+@route('/attendance/checkout', methods=['POST'])
+@login_required
+def checkout():
+    user = User.query.get(session['user_id'])
+    if user.role == 'HR':
+        flash('Admins cannot check out.', 'warning')
+        return redirect(url_for('attendance'))
+    
+    today = date.today()
+    attendance = Attendance.query.filter_by(user_id=user.id, date=today).first()
+    
+    if attendance:
+        if attendance.check_out:
+            flash('You have already checked out today.', 'warning')
+        else:
+            attendance.check_out = datetime.now().time()
+            db.session.commit()
+            flash('Check-out successful!', 'success')
+    else:
+        flash('Please check in first.', 'warning')
+    
+    return redirect(url_for('attendance'))
+
+@route('/attendance/calendar')
+@login_required
+def attendance_calendar():
+    user = User.query.get(session['user_id'])
+    year = request.args.get('year', date.today().year, type=int)
+    user_id = request.args.get('user_id', type=int)
+
+    # Admin can view any employee calendar, employees can only view their own
+    if user_id and user.role == 'HR':
+        target = User.query.get_or_404(user_id)
+    else:
+        target = user
+
+    calendar = AttendanceCalendar.query.filter_by(user_id=target.id, year=year).first()
+    days = list(calendar.days) if calendar else [0] * CALENDAR_DAYS
+    return jsonify({
+        'user_id': target.id,
+        'year': year,
+        'status_codes': CALENDAR_STATUS_CODES,
+        'days': days
+    })
+
+@route('/attendance/heatmap')
+@admin_required
+def attendance_heatmap():
+    year = request.args.get('year', date.today().year, type=int)
+    department = request.args.get('department')
+
+    query = db.session.query(User.id).filter_by(role='Employee')
+    if department:
+        query = query.filter_by(department=department)
+    user_ids = [user_id for (user_id,) in query.order_by(User.id).all()]
+
+    # Per-day counts for each status, aggregated over the whole department at once
+    grid = calendar_grid(user_ids, year)
+    counts = {status: (grid == code).sum(axis=0).tolist() for status, code in CALENDAR_STATUS_CODES.items()}
+    return jsonify({
+        'year': year,
+        'department': department,
+        'employees': len(user_ids),
+        'counts': counts
+    })
+
+@route('/reports/attendance')
+@admin_required
+def attendance_reports():
+    # Default to the current quarter
+    today = date.today()
+    quarter_start = date(today.year, 3 * ((today.month - 1) // 3) + 1, 1)
+    try:
+        start_date = datetime.strptime(request.args.get('start', quarter_start.isoformat()), '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.args.get('end', today.isoformat()), '%Y-%m-%d').date()
+    except ValueError:
+        flash('Invalid date format.', 'danger')
+        start_date, end_date = quarter_start, today
+    
+    from analytics import attendance_report
+    
+    # Department totals cover everyone; the employee table is paginated
+    page = max(request.args.get('page', 1, type=int), 1)
+    employee_rows, department_rows, employee_count = attendance_report(
+        db.session, start_date, end_date,
+        offset=(page - 1) * REPORT_PAGE_SIZE, limit=REPORT_PAGE_SIZE
+    )
+    pages = max((employee_count + REPORT_PAGE_SIZE - 1) // REPORT_PAGE_SIZE, 1)
+    return render_template('reports.html', start_date=start_date, end_date=end_date,
+                           employee_rows=employee_rows, department_rows=department_rows,
+                           employee_count=employee_count, page=page, pages=pages)
+
+@route('/audit/<entity_type>/<int:entity_id>')
+@admin_required
+def audit_history(entity_type, entity_id):
+    entries = AuditLog.query.filter_by(entity_type=entity_type, entity_id=entity_id).order_by(
+        AuditLog.changed_at.desc(), AuditLog.id.desc()
+    ).limit(request.args.get('limit', 100, type=int)).all()
+    return jsonify([{
+        'field': entry.field,
+        'old_value': entry.old_value,
+        'new_value': entry.new_value,
+        'changed_by': entry.changed_by,
+        'changed_at': entry.changed_at.isoformat()
+    } for entry in entries])
+
+@route('/admin/cache-stats')
+@admin_required
+def cache_stats():
+    return jsonify(current_app.extensions['fragment_cache'].stats())
+
+@route('/leave')
+@login_required
+def leave():
+    user = User.query.get(session['user_id'])
+    
+    # Admin sees all leave requests, employees their own
+    leave_requests = db.session.scalars(leave_requests_query(user)).all()
+    
+    return render_template('leave.html', user=user, leave_requests=leave_requests)
+
+@route('/leave/apply', methods=['GET', 'POST'])
+@login_required
+def apply_leave():
+    user = User.query.get(session['user_id'])
+    if user.role == 'HR':
+        flash('Admins cannot apply for leave through this form.', 'warning')
+        return redirect(url_for('leave'))
+    
+    if request.method == 'POST':
+        leave_type = request.form.get('leave_type')
+        start_date = request.form.get('start_date')
+        end_date = request.form.get('end_date')
+        remarks = request.form.get('remarks')
+        
+        if not all([leave_type, start_date, end_date]):
+            flash('All required fields must be filled.', 'danger')
+            return render_template('apply_leave.html', user=user)
+        
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            
+            if end_date < start_date:
+                flash('End date must be after start date.', 'danger')
+                return render_template('apply_leave.html', user=user)
+            
+            leave_request = LeaveRequest(
+                user_id=user.id,
+                leave_type=leave_type,
+                start_date=start_date,
+                end_date=end_date,
+                remarks=remarks,
+                status='Pending'
+            )
+            db.session.add(leave_request)
+            db.session.commit()
+            
+            flash('Leave request submitted successfully!', 'success')
+            return redirect(url_for('leave'))
+        except ValueError:
+            flash('Invalid date format.', 'danger')
+    
+    return render_template('apply_leave.html', user=user)
+
+@route('/leave/approve/<int:leave_id>', methods=['POST'])
+@admin_required
+def approve_leave(leave_id):
+    leave_request = LeaveRequest.query.get_or_404(leave_id)
+    action = request.form.get('action')
+    comment = request.form.get('comment', '')
+    
+    if action == 'approve':
+        leave_request.status = 'Approved'
+        leave_request.admin_comment = comment
+        
+        # Update attendance records for leave period
+        leave_days = []
+        current_date = leave_request.start_date
+        while current_date <= leave_request.end_date:
+            attendance = Attendance.query.filter_by(
+                user_id=leave_request.user_id,
+                date=current_date
+            ).first()
+            
+            if not attendance:
+                attendance = Attendance(
+                    user_id=leave_request.user_id,
+                    date=current_date,
+                    status='Leave'
+                )
+                db.session.add(attendance)
+                leave_days.append(current_date)
+            elif attendance.status == 'Absent':
+                # Days already marked Absent by the nightly job become Leave
+                attendance.status = 'Leave'
+                leave_days.append(current_date)
+            
+            current_date += timedelta(days=1)
+        
+        mark_calendar_days(leave_request.user_id, leave_days, 'Leave')
+        flash('Leave request approved!', 'success')
+    elif action == 'reject':
+        leave_request.status = 'Rejected'
+        leave_request.admin_comment = comment
+        flash('Leave request rejected.', 'info')
+    
+    db.session.commit()
+    return redirect(url_for('leave'))
+
+@route('/payroll')
+@login_required
+def payroll():
+    user = User.query.get(session['user_id'])
+    
+    # Admin sees all employees' payroll, employees their own (read-only)
+    employees = db.session.scalars(payroll_query(user)).all()
+    return render_template('payroll.html', user=user, employees=employees, is_admin=is_admin(user))
+
+@route('/payroll/update/<int:employee_id>', methods=['POST'])
+@admin_required
+def update_payroll(employee_id):
+    employee = User.query.get_or_404(employee_id)
+    new_salary = request.form.get('salary')
+    
+    try:
+        employee.salary = float(new_salary)
+        db.session.commit()
+        flash(f'Salary updated for {employee.first_name or employee.employee_id}', 'success')
+    except ValueError:
+        flash('Invalid salary amount.', 'danger')
+    
+    return redirect(url_for('payroll'))
@@ -2,7 +2,9 @@
 Database Seeding Script
 Adds default employees, attendance records, and other data to the database
 """
-from app import app, db, User, Attendance, LeaveRequest
+from app import create_app
+from models import db, User, Attendance, AttendanceCalendar, LeaveRequest
+from calendars import rebuild_attendance_calendar
 from werkzeug.security import generate_password_hash
 from datetime import datetime, date, timedelta
 import random
@@ -220,10 +222,12 @@ def create_leave_requests(user):
 
 def seed_database():
     """Main function to seed the database"""
+    app = create_app(web=False)
     with app.app_context():
         # Clear existing data (optional - comment out if you want to keep existing data)
         print("Clearing existing data...")
         db.session.query(LeaveRequest).delete()
+        db.session.query(AttendanceCalendar).delete()
         db.session.query(Attendance).delete()
         db.session.query(User).delete()
         db.session.commit()
@@ -300,6 +304,11 @@ def seed_database():
         db.session.commit()
         print("Attendance records created")
         
+        # Build yearly attendance calendars from the seeded records
+        calendar_count = rebuild_attendance_calendar()
+        db.session.commit()
+        print(f"Built {calendar_count} attendance calendars")
+        
         # Create leave requests
         print("\nCreating leave requests...")
         for user in users:
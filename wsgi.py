@@ -0,0 +1,8 @@
+"""
+WSGI entry point
+Build the app once here so a pre-forking server (e.g. `gunicorn --preload wsgi:app`)
+runs the factory and schema check in the master process and workers start from a fork
+"""
+from app import create_app
+
+app = create_app()